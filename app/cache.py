@@ -1,71 +1,115 @@
-import asyncio
-import json
+import time
+from collections import OrderedDict
+from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import select
+import orjson
 
-from .database import SessionLocal
-from .models import RepositoryCache
+from .database import get_pool
+
+
+def _utcnow() -> str:
+	# Same text format as rows written by earlier SQLAlchemy-based versions
+	return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _org_key(org: Optional[str]) -> str:
+	# Matches the ifnull(org, '') expression of the ux_repo_org index
+	return org or ""
+
+
+# In-process LRU in front of SQLite, keyed like ux_repo_org. The TTL bounds how long another worker
+# process can serve an entry this process has since overwritten or deleted.
+_MEM_CACHE_SIZE = 1024
+_MEM_CACHE_TTL_SECONDS = 300.0
+_mem_cache: OrderedDict[tuple[str, str], tuple[float, dict[str, Any]]] = OrderedDict()
+# Bumped on every invalidation so a DB read that raced with a write does not repopulate a stale entry
+_mem_generation = 0
+
+
+def _mem_get(key: tuple[str, str]) -> Optional[dict[str, Any]]:
+	entry = _mem_cache.get(key)
+	if entry is None:
+		return None
+	expires_at, payload = entry
+	if expires_at < time.monotonic():
+		del _mem_cache[key]
+		return None
+	_mem_cache.move_to_end(key)
+	return payload
+
+
+def _mem_put(key: tuple[str, str], payload: dict[str, Any]) -> None:
+	_mem_cache[key] = (time.monotonic() + _MEM_CACHE_TTL_SECONDS, payload)
+	_mem_cache.move_to_end(key)
+	while len(_mem_cache) > _MEM_CACHE_SIZE:
+		_mem_cache.popitem(last=False)
+
+
+def _mem_invalidate(key: tuple[str, str]) -> None:
+	global _mem_generation
+	_mem_generation += 1
+	_mem_cache.pop(key, None)
 
 
 async def get_cached_response(repo_full_name: str, org: Optional[str]) -> Optional[dict[str, Any]]:
-	def _get() -> Optional[dict[str, Any]]:
-		with SessionLocal() as session:
-			statement = select(RepositoryCache).where(
-				RepositoryCache.repo_full_name == repo_full_name, RepositoryCache.org == org
-			)
-			result = session.execute(statement).scalar_one_or_none()
-			if not result:
-				return None
-			return json.loads(result.response_json)
+	"""The returned dict may be shared with other callers and must not be mutated."""
+	key = (repo_full_name, _org_key(org))
+	cached = _mem_get(key)
+	if cached is not None:
+		return cached
 
-	return await asyncio.to_thread(_get)
+	generation = _mem_generation
+	async with get_pool().connection() as conn:
+		async with conn.execute(
+			"SELECT response_json FROM repository_cache WHERE repo_full_name = ? AND ifnull(org, '') = ? LIMIT 1",
+			key,
+		) as cursor:
+			row = await cursor.fetchone()
+	if row is None:
+		return None
+	payload = orjson.loads(row[0])
+	if generation == _mem_generation:
+		_mem_put(key, payload)
+	return payload
 
 
 async def upsert_cached_response(repo_full_name: str, org: Optional[str], payload: dict[str, Any]) -> None:
-	data = json.dumps(payload)
-
-	def _upsert() -> None:
-		with SessionLocal() as session:
-			statement = select(RepositoryCache).where(
-				RepositoryCache.repo_full_name == repo_full_name, RepositoryCache.org == org
-			)
-			entry = session.execute(statement).scalar_one_or_none()
-			if entry:
-				entry.response_json = data
-			else:
-				entry = RepositoryCache(repo_full_name=repo_full_name, org=org, response_json=data)
-				session.add(entry)
-			session.commit()
+	data = orjson.dumps(payload)
+	now = _utcnow()
 
-	await asyncio.to_thread(_upsert)
+	async with get_pool().connection() as conn:
+		await conn.execute(
+			"INSERT INTO repository_cache (repo_full_name, org, response_json, created_at, updated_at) "
+			"VALUES (?, ?, ?, ?, ?) "
+			"ON CONFLICT (repo_full_name, ifnull(org, '')) "
+			"DO UPDATE SET response_json = excluded.response_json, updated_at = excluded.updated_at",
+			(repo_full_name, org, data, now, now),
+		)
+		await conn.commit()
+	_mem_invalidate((repo_full_name, _org_key(org)))
 
 
 async def repository_exists(repo_full_name: str, org: Optional[str]) -> bool:
 	"""Check if a repository exists in the cache database."""
-	def _check() -> bool:
-		with SessionLocal() as session:
-			statement = select(RepositoryCache).where(
-				RepositoryCache.repo_full_name == repo_full_name, RepositoryCache.org == org
-			)
-			result = session.execute(statement).scalar_one_or_none()
-			return result is not None
-
-	return await asyncio.to_thread(_check)
+	key = (repo_full_name, _org_key(org))
+	if _mem_get(key) is not None:
+		return True
+	async with get_pool().connection() as conn:
+		async with conn.execute(
+			"SELECT 1 FROM repository_cache WHERE repo_full_name = ? AND ifnull(org, '') = ? LIMIT 1",
+			key,
+		) as cursor:
+			return await cursor.fetchone() is not None
 
 
 async def delete_cached_response(repo_full_name: str, org: Optional[str]) -> bool:
 	"""Delete a repository cache entry from the database. Returns True if deleted, False if not found."""
-	def _delete() -> bool:
-		with SessionLocal() as session:
-			statement = select(RepositoryCache).where(
-				RepositoryCache.repo_full_name == repo_full_name, RepositoryCache.org == org
-			)
-			entry = session.execute(statement).scalar_one_or_none()
-			if not entry:
-				return False
-			session.delete(entry)
-			session.commit()
-			return True
-
-	return await asyncio.to_thread(_delete)
\ No newline at end of file
+	async with get_pool().connection() as conn:
+		cursor = await conn.execute(
+			"DELETE FROM repository_cache WHERE repo_full_name = ? AND ifnull(org, '') = ?",
+			(repo_full_name, _org_key(org)),
+		)
+		await conn.commit()
+	_mem_invalidate((repo_full_name, _org_key(org)))
+	return cursor.rowcount > 0
@@ -1,51 +1,85 @@
-import asyncio
 import os
 from pathlib import Path
-from typing import AsyncIterator, Iterator
+from typing import Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+import aiosqlite
+from aiosqlitepool import SQLiteConnectionPool
 
-from .models import Base
+from .models import REPOSITORY_CACHE_SCHEMA
 
 
-def _build_sqlite_path(db_url: str) -> None:
+def _sqlite_file_path(db_url: str) -> str:
 	"""
-	Ensure directory exists if we are using a filesystem SQLite URL like sqlite:///./data/cache.db
+	Extract the database file path from a SQLite URL like sqlite:///./data/cache.db
 	"""
-	if db_url.startswith("sqlite:///"):
-		path = db_url.replace("sqlite:///", "", 1)
-		if path.startswith("./"):
-			path = path[2:]
-		db_path = Path(path)
-		if db_path.parent:
-			db_path.parent.mkdir(parents=True, exist_ok=True)
+	if not db_url.startswith("sqlite:///"):
+		raise RuntimeError(f"Unsupported DATABASE_URL {db_url!r}: the repository cache requires SQLite")
+	path = db_url.replace("sqlite:///", "", 1)
+	if path.startswith("./"):
+		path = path[2:]
+	return path
+
+
+def _build_sqlite_path(db_path: str) -> None:
+	"""
+	Ensure directory exists for a filesystem SQLite database
+	"""
+	parent = Path(db_path).parent
+	if parent:
+		parent.mkdir(parents=True, exist_ok=True)
 
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/cache.db")
-_build_sqlite_path(DATABASE_URL)
+DATABASE_PATH = _sqlite_file_path(DATABASE_URL)
+_build_sqlite_path(DATABASE_PATH)
+
+# WAL lets cache reads proceed while an upsert is writing; NORMAL is durable enough under WAL.
+_SQLITE_PRAGMAS = (
+	"PRAGMA journal_mode=WAL",
+	"PRAGMA synchronous=NORMAL",
+	"PRAGMA temp_store=MEMORY",
+	"PRAGMA cache_size=-64000",
+	"PRAGMA busy_timeout=5000",
+)
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+async def _connect() -> aiosqlite.Connection:
+	conn = await aiosqlite.connect(DATABASE_PATH)
+	for pragma in _SQLITE_PRAGMAS:
+		await conn.execute(pragma)
+	return conn
 
-def get_session() -> Iterator[Session]:
-	session = SessionLocal()
-	try:
-		yield session
-	finally:
-		session.close()
+
+# Long-lived connections keep SQLite's page cache warm between requests. Created on first use and
+# dropped by close_db, so a later init_db (e.g. a second app lifespan) starts over with a fresh pool.
+_pool: Optional[SQLiteConnectionPool] = None
+
+
+def get_pool() -> SQLiteConnectionPool:
+	global _pool
+	if _pool is None:
+		_pool = SQLiteConnectionPool(connection_factory=_connect, pool_size=8)
+	return _pool
 
 
 async def init_db() -> None:
 	"""
-	Run metadata creation in a thread to avoid blocking the event loop.
+	Apply the cache schema unless sqlite_master already lists ux_repo_org, the last object it creates.
 	"""
-
-	def _create_all() -> None:
-		Base.metadata.create_all(bind=engine)
-
-	await asyncio.to_thread(_create_all)
+	# The check and the DDL share one connection, so it never holds a stale copy of the schema
+	async with get_pool().connection() as conn:
+		async with conn.execute(
+			"SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_repo_org'"
+		) as cursor:
+			if await cursor.fetchone() is not None:
+				return
+		for statement in REPOSITORY_CACHE_SCHEMA:
+			await conn.execute(statement)
+		await conn.commit()
 
 
+async def close_db() -> None:
+	global _pool
+	if _pool is not None:
+		await _pool.close()
+		_pool = None
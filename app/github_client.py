@@ -1,9 +1,12 @@
+import asyncio
+import functools
 import logging
 import os
 import re
 from typing import Optional
 
 import httpx
+import orjson
 from dotenv import load_dotenv
 
 from .cache import get_cached_response, upsert_cached_response
@@ -13,7 +16,39 @@ load_dotenv()
 GITHUB_API_BASE = "https://api.github.com"
 logger = logging.getLogger("app.github_client")
 
+_SSH_RE = re.compile(r"^git@github\.com:(?P<owner>[\w.-]+)/(?P<repo>[\w.-]+)(?:\.git)?$")
+_HTTP_RE = re.compile(r"^https?://github\.com/(?P<owner>[\w.-]+)/(?P<repo>[\w.-]+)(?:\.git)?/?$")
 
+# Forks in flight keyed by (repo_full_name, org, use_cache); concurrent callers for the same key share one GitHub request
+_inflight_forks: dict[tuple[str, Optional[str], bool], asyncio.Task] = {}
+
+# Shared client so GitHub calls reuse pooled keep-alive (HTTP/2) connections instead of a new TLS handshake each time
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+	global _client
+	if _client is None or _client.is_closed:
+		_client = httpx.AsyncClient(
+			http2=True,
+			timeout=15.0,
+			limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+		)
+	return _client
+
+
+async def init_client() -> None:
+	_get_client()
+
+
+async def close_client() -> None:
+	global _client
+	if _client is not None:
+		await _client.aclose()
+		_client = None
+
+
+@functools.lru_cache(maxsize=1)
 def get_github_pat() -> str:
 	pat = os.getenv("GITHUB_PAT") or ""
 	if not pat:
@@ -21,6 +56,19 @@ def get_github_pat() -> str:
 	return pat
 
 
+@functools.lru_cache(maxsize=1)
+def _github_headers() -> dict[str, str]:
+	"""
+	Default headers for every GitHub API request. Built once; callers must not mutate the returned dict.
+	"""
+	return {
+		"Accept": "application/vnd.github+json",
+		"Authorization": f"Bearer {get_github_pat()}",
+		"X-GitHub-Api-Version": "2022-11-28",
+		"User-Agent": "DPostBackend/0.1 (+fastapi; httpx)",
+	}
+
+
 def parse_repo_url(repo_url: str) -> Optional[tuple[str, str]]:
 	"""
 	Support forms:
@@ -32,7 +80,7 @@ def parse_repo_url(repo_url: str) -> Optional[tuple[str, str]]:
 	"""
 	url = repo_url.strip()
 	# SSH form
-	ssh_match = re.match(r"^git@github\.com:(?P<owner>[\w.-]+)/(?P<repo>[\w.-]+)(?:\.git)?$", url)
+	ssh_match = _SSH_RE.match(url)
 	if ssh_match:
 		owner = ssh_match.group("owner")
 		repo = ssh_match.group("repo")
@@ -41,7 +89,7 @@ def parse_repo_url(repo_url: str) -> Optional[tuple[str, str]]:
 		return owner, repo
 
 	# HTTP/HTTPS form
-	http_match = re.match(r"^https?://github\.com/(?P<owner>[\w.-]+)/(?P<repo>[\w.-]+)(?:\.git)?/?$", url)
+	http_match = _HTTP_RE.match(url)
 	if http_match:
 		owner = http_match.group("owner")
 		repo = http_match.group("repo")
@@ -53,6 +101,13 @@ def parse_repo_url(repo_url: str) -> Optional[tuple[str, str]]:
 	return None
 
 
+def normalize_org(org: Optional[str]) -> Optional[str]:
+	"""Strip surrounding whitespace; a missing or blank org means "no org"."""
+	if not org:
+		return None
+	return org.strip() or None
+
+
 async def fork_repository(
 	repo_url: str,
 	org: Optional[str] = None,
@@ -64,8 +119,7 @@ async def fork_repository(
 	Returns the GitHub API response JSON.
 	"""
 	logger.info("Fork request: repo_url=%s, org=%s", repo_url, org)
-	repo_url = str(repo_url).strip()
-	org = str(org).strip() if org else None
+	org = normalize_org(org)
 	parsed = parse_repo_url(repo_url)
 	if not parsed:
 		raise ValueError("Invalid GitHub repository URL")
@@ -80,13 +134,35 @@ async def fork_repository(
 			logger.info("Cache hit for repo=%s org=%s", repo_full_name, org)
 			return cached
 
-	pat = get_github_pat()
-	headers = {
-		"Accept": "application/vnd.github+json",
-		"Authorization": f"Bearer {pat}",
-		"X-GitHub-Api-Version": "2022-11-28",
-		"User-Agent": "DPostBackend/0.1 (+fastapi; httpx)",
-	}
+	# use_cache is part of the key so a use_cache=False caller never joins a fork that writes the cache
+	key = (repo_full_name, org, use_cache)
+	task = _inflight_forks.get(key)
+	if task is None:
+		task = asyncio.create_task(_request_fork(owner, repo, org, timeout_seconds, use_cache))
+		_inflight_forks[key] = task
+		task.add_done_callback(functools.partial(_fork_done, key))
+	else:
+		logger.info("Joining in-flight fork request for repo=%s org=%s", repo_full_name, org)
+	# Shielded so a caller that goes away does not cancel the fork for everyone else waiting on it
+	return await asyncio.shield(task)
+
+
+def _fork_done(key: tuple[str, Optional[str], bool], task: asyncio.Task) -> None:
+	if _inflight_forks.get(key) is task:
+		del _inflight_forks[key]
+	# Retrieve the exception so it is not logged as never retrieved when every waiter has gone away
+	if not task.cancelled():
+		task.exception()
+
+
+async def _request_fork(
+	owner: str,
+	repo: str,
+	org: Optional[str],
+	timeout_seconds: float,
+	use_cache: bool,
+) -> dict:
+	headers = _github_headers()
 
 	payload = {}
 	if org:
@@ -95,30 +171,30 @@ async def fork_repository(
 	url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/forks"
 	logger.debug("POST %s payload=%s", url, payload or None)
 
-	async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-		response = await client.post(url, headers=headers, json=payload or None)
-		logger.info("GitHub response: status=%s", response.status_code)
-		if response.status_code >= 400:
-			# Surface useful error information
-			try:
-				err_json = response.json()
-			except Exception:
-				err_json = {"message": response.text}
-			logger.error("GitHub API error %s: %s", response.status_code, err_json)
-			raise httpx.HTTPStatusError(
-				message=f"GitHub API error {response.status_code}: {err_json.get('message')}",
-				request=response.request,
-				response=response,
-			)
+	client = _get_client()
+	response = await client.post(url, headers=headers, json=payload or None, timeout=timeout_seconds)
+	logger.info("GitHub response: status=%s", response.status_code)
+	if response.status_code >= 400:
+		# Surface useful error information
 		try:
-			body = response.json()
+			err_json = orjson.loads(response.content)
 		except Exception:
-			body = {"message": "<non-json-response>"}
-		logger.debug("GitHub success body received")
+			err_json = {"message": response.text}
+		logger.error("GitHub API error %s: %s", response.status_code, err_json)
+		raise httpx.HTTPStatusError(
+			message=f"GitHub API error {response.status_code}: {err_json.get('message')}",
+			request=response.request,
+			response=response,
+		)
+	try:
+		body = orjson.loads(response.content)
+	except Exception:
+		body = {"message": "<non-json-response>"}
+	logger.debug("GitHub success body received")
 
-		if use_cache:
-			await upsert_cached_response(repo_full_name, org, body)
-		return body
+	if use_cache:
+		await upsert_cached_response(f"{owner}/{repo}", org, body)
+	return body
 
 
 async def delete_repository(
@@ -134,39 +210,33 @@ async def delete_repository(
 	"""
 	logger.info("Delete repository request: fork_owner=%s, repo=%s", fork_owner, repo)
 
-	pat = get_github_pat()
-	headers = {
-		"Accept": "application/vnd.github+json",
-		"Authorization": f"Bearer {pat}",
-		"X-GitHub-Api-Version": "2022-11-28",
-		"User-Agent": "DPostBackend/0.1 (+fastapi; httpx)",
-	}
+	headers = _github_headers()
 
 	url = f"{GITHUB_API_BASE}/repos/{fork_owner}/{repo}"
 	logger.debug("DELETE %s", url)
 
-	async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-		response = await client.delete(url, headers=headers)
-		logger.info("GitHub response: status=%s", response.status_code)
-		# 204 No Content is the expected success response for delete
-		if response.status_code == 204:
-			logger.info("Repository deleted successfully")
-			return
-		# Handle error status codes
-		if response.status_code >= 400:
-			# Surface useful error information
-			try:
-				err_json = response.json()
-			except Exception:
-				err_json = {"message": response.text}
-			logger.error("GitHub API error %s: %s", response.status_code, err_json)
-			raise httpx.HTTPStatusError(
-				message=f"GitHub API error {response.status_code}: {err_json.get('message', 'Unknown error')}",
-				request=response.request,
-				response=response,
-			)
-		# Unexpected status code (not 204 and not error)
-		logger.warning("Unexpected status code: %s", response.status_code)
+	client = _get_client()
+	response = await client.delete(url, headers=headers, timeout=timeout_seconds)
+	logger.info("GitHub response: status=%s", response.status_code)
+	# 204 No Content is the expected success response for delete
+	if response.status_code == 204:
+		logger.info("Repository deleted successfully")
+		return
+	# Handle error status codes
+	if response.status_code >= 400:
+		# Surface useful error information
+		try:
+			err_json = orjson.loads(response.content)
+		except Exception:
+			err_json = {"message": response.text}
+		logger.error("GitHub API error %s: %s", response.status_code, err_json)
+		raise httpx.HTTPStatusError(
+			message=f"GitHub API error {response.status_code}: {err_json.get('message', 'Unknown error')}",
+			request=response.request,
+			response=response,
+		)
+	# Unexpected status code (not 204 and not error)
+	logger.warning("Unexpected status code: %s", response.status_code)
 
 
 async def get_file_content(
@@ -182,35 +252,29 @@ async def get_file_content(
 	"""
 	logger.info("Get file request: fork_owner=%s, repo=%s, path=%s, branch=%s", fork_owner, repo, path, branch)
 
-	pat = get_github_pat()
-	headers = {
-		"Accept": "application/vnd.github+json",
-		"Authorization": f"Bearer {pat}",
-		"X-GitHub-Api-Version": "2022-11-28",
-		"User-Agent": "DPostBackend/0.1 (+fastapi; httpx)",
-	}
+	headers = _github_headers()
 
 	url = f"{GITHUB_API_BASE}/repos/{fork_owner}/{repo}/contents/{path}"
 	params = {"ref": branch}
 
-	async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-		response = await client.get(url, headers=headers, params=params)
-		logger.info("GitHub response: status=%s", response.status_code)
-		if response.status_code == 404:
-			# File doesn't exist, return None
-			return None
-		if response.status_code >= 400:
-			try:
-				err_json = response.json()
-			except Exception:
-				err_json = {"message": response.text}
-			logger.error("GitHub API error %s: %s", response.status_code, err_json)
-			raise httpx.HTTPStatusError(
-				message=f"GitHub API error {response.status_code}: {err_json.get('message', 'Unknown error')}",
-				request=response.request,
-				response=response,
-			)
-		return response.json()
+	client = _get_client()
+	response = await client.get(url, headers=headers, params=params, timeout=timeout_seconds)
+	logger.info("GitHub response: status=%s", response.status_code)
+	if response.status_code == 404:
+		# File doesn't exist, return None
+		return None
+	if response.status_code >= 400:
+		try:
+			err_json = orjson.loads(response.content)
+		except Exception:
+			err_json = {"message": response.text}
+		logger.error("GitHub API error %s: %s", response.status_code, err_json)
+		raise httpx.HTTPStatusError(
+			message=f"GitHub API error {response.status_code}: {err_json.get('message', 'Unknown error')}",
+			request=response.request,
+			response=response,
+		)
+	return orjson.loads(response.content)
 
 
 async def create_or_update_file(
@@ -229,13 +293,7 @@ async def create_or_update_file(
 	"""
 	logger.info("Create/update file request: fork_owner=%s, repo=%s, path=%s", fork_owner, repo, path)
 
-	pat = get_github_pat()
-	headers = {
-		"Accept": "application/vnd.github+json",
-		"Authorization": f"Bearer {pat}",
-		"X-GitHub-Api-Version": "2022-11-28",
-		"User-Agent": "DPostBackend/0.1 (+fastapi; httpx)",
-	}
+	headers = _github_headers()
 
 	# Check if file exists to get its SHA
 	existing_file = await get_file_content(fork_owner, repo, path, branch, timeout_seconds)
@@ -261,21 +319,21 @@ async def create_or_update_file(
 
 	url = f"{GITHUB_API_BASE}/repos/{fork_owner}/{repo}/contents/{path}"
 
-	async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-		response = await client.put(url, headers=headers, json=payload)
-		logger.info("GitHub response: status=%s", response.status_code)
-		if response.status_code >= 400:
-			try:
-				err_json = response.json()
-			except Exception:
-				err_json = {"message": response.text}
-			logger.error("GitHub API error %s: %s", response.status_code, err_json)
-			raise httpx.HTTPStatusError(
-				message=f"GitHub API error {response.status_code}: {err_json.get('message', 'Unknown error')}",
-				request=response.request,
-				response=response,
-			)
-		return response.json()
+	client = _get_client()
+	response = await client.put(url, headers=headers, json=payload, timeout=timeout_seconds)
+	logger.info("GitHub response: status=%s", response.status_code)
+	if response.status_code >= 400:
+		try:
+			err_json = orjson.loads(response.content)
+		except Exception:
+			err_json = {"message": response.text}
+		logger.error("GitHub API error %s: %s", response.status_code, err_json)
+		raise httpx.HTTPStatusError(
+			message=f"GitHub API error {response.status_code}: {err_json.get('message', 'Unknown error')}",
+			request=response.request,
+			response=response,
+		)
+	return orjson.loads(response.content)
 
 
 async def trigger_workflow(
@@ -300,80 +358,74 @@ async def trigger_workflow(
 	"""
 	logger.info("Trigger workflow request: fork_owner=%s, repo=%s, workflow_id=%s, branch=%s", fork_owner, repo, workflow_id, branch)
 
-	pat = get_github_pat()
-	headers = {
-		"Accept": "application/vnd.github+json",
-		"Authorization": f"Bearer {pat}",
-		"X-GitHub-Api-Version": "2022-11-28",
-		"User-Agent": "DPostBackend/0.1 (+fastapi; httpx)",
-	}
+	headers = _github_headers()
 
 	# First, get the workflow ID by file name
 	# List workflows to find the one we want
 	workflows_url = f"{GITHUB_API_BASE}/repos/{fork_owner}/{repo}/actions/workflows"
 	
-	async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-		# Get list of workflows
-		workflows_response = await client.get(workflows_url, headers=headers)
-		if workflows_response.status_code >= 400:
-			try:
-				err_json = workflows_response.json()
-			except Exception:
-				err_json = {"message": workflows_response.text}
-			logger.error("GitHub API error %s: %s", workflows_response.status_code, err_json)
-			raise httpx.HTTPStatusError(
-				message=f"GitHub API error {workflows_response.status_code}: {err_json.get('message', 'Unknown error')}",
-				request=workflows_response.request,
-				response=workflows_response,
-			)
-		
-		workflows_data = workflows_response.json()
-		workflows = workflows_data.get("workflows", [])
-		
-		# Find workflow by name
-		workflow_id_num = None
-		for workflow in workflows:
-			if workflow.get("path") == f".github/workflows/{workflow_id}" or workflow.get("name") == workflow_id:
-				workflow_id_num = workflow.get("id")
-				break
-		
-		if not workflow_id_num:
-			# If not found by name, try using the workflow_id directly as numeric ID
-			logger.warning("Workflow %s not found by name, trying as ID", workflow_id)
-			try:
-				workflow_id_num = int(workflow_id)
-			except ValueError:
-				raise ValueError(f"Workflow '{workflow_id}' not found and is not a valid workflow ID")
-
-		# Trigger the workflow
-		trigger_url = f"{GITHUB_API_BASE}/repos/{fork_owner}/{repo}/actions/workflows/{workflow_id_num}/dispatches"
-		payload = {
-			"ref": branch,
-		}
-		
-		trigger_response = await client.post(trigger_url, headers=headers, json=payload)
-		logger.info("GitHub workflow trigger response: status=%s", trigger_response.status_code)
-		
-		if trigger_response.status_code == 204:
-			# 204 No Content is the expected success response
-			logger.info("Workflow triggered successfully")
-			return {"status": "triggered", "workflow_id": workflow_id_num}
-		
-		if trigger_response.status_code >= 400:
-			try:
-				err_json = trigger_response.json()
-			except Exception:
-				err_json = {"message": trigger_response.text}
-			logger.error("GitHub API error %s: %s", trigger_response.status_code, err_json)
-			raise httpx.HTTPStatusError(
-				message=f"GitHub API error {trigger_response.status_code}: {err_json.get('message', 'Unknown error')}",
-				request=trigger_response.request,
-				response=trigger_response,
-			)
-		
-		# Unexpected status code
-		logger.warning("Unexpected status code: %s", trigger_response.status_code)
-		return {"status": "unknown", "status_code": trigger_response.status_code}
+	client = _get_client()
+	# Get list of workflows
+	workflows_response = await client.get(workflows_url, headers=headers, timeout=timeout_seconds)
+	if workflows_response.status_code >= 400:
+		try:
+			err_json = orjson.loads(workflows_response.content)
+		except Exception:
+			err_json = {"message": workflows_response.text}
+		logger.error("GitHub API error %s: %s", workflows_response.status_code, err_json)
+		raise httpx.HTTPStatusError(
+			message=f"GitHub API error {workflows_response.status_code}: {err_json.get('message', 'Unknown error')}",
+			request=workflows_response.request,
+			response=workflows_response,
+		)
+	
+	workflows_data = orjson.loads(workflows_response.content)
+	workflows = workflows_data.get("workflows", [])
+	
+	# Find workflow by name
+	workflow_id_num = None
+	for workflow in workflows:
+		if workflow.get("path") == f".github/workflows/{workflow_id}" or workflow.get("name") == workflow_id:
+			workflow_id_num = workflow.get("id")
+			break
+	
+	if not workflow_id_num:
+		# If not found by name, try using the workflow_id directly as numeric ID
+		logger.warning("Workflow %s not found by name, trying as ID", workflow_id)
+		try:
+			workflow_id_num = int(workflow_id)
+		except ValueError:
+			raise ValueError(f"Workflow '{workflow_id}' not found and is not a valid workflow ID")
+
+	# Trigger the workflow
+	trigger_url = f"{GITHUB_API_BASE}/repos/{fork_owner}/{repo}/actions/workflows/{workflow_id_num}/dispatches"
+	payload = {
+		"ref": branch,
+	}
+	
+	trigger_response = await client.post(trigger_url, headers=headers, json=payload, timeout=timeout_seconds)
+	logger.info("GitHub workflow trigger response: status=%s", trigger_response.status_code)
+	
+	if trigger_response.status_code == 204:
+		# 204 No Content is the expected success response
+		logger.info("Workflow triggered successfully")
+		return {"status": "triggered", "workflow_id": workflow_id_num}
+	
+	if trigger_response.status_code >= 400:
+		try:
+			err_json = orjson.loads(trigger_response.content)
+		except Exception:
+			err_json = {"message": trigger_response.text}
+		logger.error("GitHub API error %s: %s", trigger_response.status_code, err_json)
+		raise httpx.HTTPStatusError(
+			message=f"GitHub API error {trigger_response.status_code}: {err_json.get('message', 'Unknown error')}",
+			request=trigger_response.request,
+			response=trigger_response,
+		)
+	
+	# Unexpected status code
+	logger.warning("Unexpected status code: %s", trigger_response.status_code)
+	return {"status": "unknown", "status_code": trigger_response.status_code}
 
 
 async def merge_upstream(
@@ -391,35 +443,29 @@ async def merge_upstream(
     """
     logger.info("Merge upstream request: fork_owner=%s, repo=%s, branch=%s", fork_owner, repo, branch)
 
-    pat = get_github_pat()
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {pat}",
-        "X-GitHub-Api-Version": "2022-11-28",
-        "User-Agent": "DPostBackend/0.1 (+fastapi; httpx)",
-    }
+    headers = _github_headers()
 
     url = f"{GITHUB_API_BASE}/repos/{fork_owner}/{repo}/merge-upstream"
     payload = {"branch": branch}
 
-    async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-        response = await client.post(url, headers=headers, json=payload)
-        logger.info("GitHub merge-upstream response: status=%s", response.status_code)
-        # 200 OK or 202 Accepted are expected
-        if response.status_code >= 400:
-            try:
-                err_json = response.json()
-            except Exception:
-                err_json = {"message": response.text}
-            logger.error("GitHub API error %s: %s", response.status_code, err_json)
-            raise httpx.HTTPStatusError(
-                message=f"GitHub API error {response.status_code}: {err_json.get('message', 'Unknown error')}",
-                request=response.request,
-                response=response,
-            )
-
-        # Try to return JSON if present, otherwise return status info
+    client = _get_client()
+    response = await client.post(url, headers=headers, json=payload, timeout=timeout_seconds)
+    logger.info("GitHub merge-upstream response: status=%s", response.status_code)
+    # 200 OK or 202 Accepted are expected
+    if response.status_code >= 400:
         try:
-            return response.json()
+            err_json = orjson.loads(response.content)
         except Exception:
-            return {"status_code": response.status_code, "content": response.text}
\ No newline at end of file
+            err_json = {"message": response.text}
+        logger.error("GitHub API error %s: %s", response.status_code, err_json)
+        raise httpx.HTTPStatusError(
+            message=f"GitHub API error {response.status_code}: {err_json.get('message', 'Unknown error')}",
+            request=response.request,
+            response=response,
+        )
+
+    # Try to return JSON if present, otherwise return status info
+    try:
+        return orjson.loads(response.content)
+    except Exception:
+        return {"status_code": response.status_code, "content": response.text}
\ No newline at end of file
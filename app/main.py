@@ -4,16 +4,17 @@ import logging
 from fastapi import BackgroundTasks, FastAPI, File, Form, HTTPException, Query, UploadFile
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .cache import delete_cached_response, get_cached_response, repository_exists
-from .database import init_db
-from .github_client import create_or_update_file, fork_repository, get_file_content, parse_repo_url, trigger_workflow, merge_upstream
+from .database import close_db, init_db
+from .github_client import close_client, create_or_update_file, fork_repository, get_file_content, init_client, normalize_org, parse_repo_url, trigger_workflow, merge_upstream
 from .logging_config import configure_logging
 from .test_case_storage import delete_test_case, load_test_case, save_test_case, test_case_exists
 from .workflow_generator import generate_workflow
 
 configure_logging()
-app = FastAPI(title="DPostBackend", version="0.1.0")
+app = FastAPI(title="DPostBackend", version="0.1.0", default_response_class=ORJSONResponse)
 logger = logging.getLogger("app.main")
 
 # CORS for local frontend dev
@@ -34,6 +35,13 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event() -> None:
 	await init_db()
+	await init_client()
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+	await close_client()
+	await close_db()
 
 
 @app.get("/health")
@@ -70,14 +78,14 @@ async def submit_test_results(payload: TestResultRequest):
 	)
 
 	# Parse repository URL
-	parsed = parse_repo_url(payload.repo_url.strip())
+	parsed = parse_repo_url(payload.repo_url)
 	if not parsed:
 		raise HTTPException(status_code=400, detail="Invalid GitHub repository URL")
 	original_owner, repo = parsed
 	repo_full_name = f"{original_owner}/{repo}"
 
 	# Normalize org
-	normalized_org = payload.org.strip() if payload.org and payload.org.strip() else None
+	normalized_org = normalize_org(payload.org)
 
 	# Save test results to file
 	import os
@@ -151,14 +159,14 @@ async def get_test_results(
 		raise HTTPException(status_code=404, detail="No test results found")
 
 	# Parse repository URL
-	parsed = parse_repo_url(repo_url.strip())
+	parsed = parse_repo_url(repo_url)
 	if not parsed:
 		raise HTTPException(status_code=400, detail="Invalid GitHub repository URL")
 	owner, repo = parsed
 	repo_full_name = f"{owner}/{repo}"
 
 	# Normalize org
-	normalized_org = org.strip() if org and org.strip() else None
+	normalized_org = normalize_org(org)
 
 	# Try to find fork information from database (in case query is for original repo)
 	# This helps us find test results that were saved with fork repo name
@@ -285,7 +293,7 @@ class ForkRequest(BaseModel):
 async def create_fork(payload: ForkRequest):
 	logger.info("POST /repos/fork received: repo_url=%s, org=%s", payload.repo_url, payload.org)
 	try:
-		result = await fork_repository(str(payload.repo_url).strip(), payload.org)
+		result = await fork_repository(payload.repo_url, payload.org)
 		# Only log minimal success info; GitHub payload could be large
 		logger.info("Fork requested successfully")
 		return {"status": "ok", "data": result}
@@ -325,14 +333,14 @@ async def submit_test_case(
 		)
 
 	# Parse repository URL
-	parsed = parse_repo_url(repo_url.strip())
+	parsed = parse_repo_url(repo_url)
 	if not parsed:
 		raise HTTPException(status_code=400, detail="Invalid GitHub repository URL")
 	owner, repo = parsed
 	repo_full_name = f"{owner}/{repo}"
 
 	# Normalize org (strip if provided)
-	normalized_org = org.strip() if org and org.strip() else None
+	normalized_org = normalize_org(org)
 
 	# Check if repository exists in database
 	exists = await repository_exists(repo_full_name, normalized_org)
@@ -409,14 +417,14 @@ async def update_test_case(
 		)
 
 	# Parse repository URL
-	parsed = parse_repo_url(repo_url.strip())
+	parsed = parse_repo_url(repo_url)
 	if not parsed:
 		raise HTTPException(status_code=400, detail="Invalid GitHub repository URL")
 	owner, repo = parsed
 	repo_full_name = f"{owner}/{repo}"
 
 	# Normalize org (strip if provided)
-	normalized_org = org.strip() if org and org.strip() else None
+	normalized_org = normalize_org(org)
 
 	# Check if repository exists in database
 	exists = await repository_exists(repo_full_name, normalized_org)
@@ -489,14 +497,14 @@ async def delete_repository_endpoint(payload: DeleteRepositoryRequest):
 	logger.info("DELETE /repos received: repo_url=%s, org=%s", payload.repo_url, payload.org)
 
 	# Parse repository URL
-	parsed = parse_repo_url(payload.repo_url.strip())
+	parsed = parse_repo_url(payload.repo_url)
 	if not parsed:
 		raise HTTPException(status_code=400, detail="Invalid GitHub repository URL")
 	original_owner, repo = parsed
 	repo_full_name = f"{original_owner}/{repo}"
 
 	# Normalize org
-	normalized_org = payload.org.strip() if payload.org and payload.org.strip() else None
+	normalized_org = normalize_org(payload.org)
 
 	# Check if repository exists in database
 	exists = await repository_exists(repo_full_name, normalized_org)
@@ -772,29 +780,21 @@ async def push_test_case_to_repo(payload: PushTestCaseRequest):
 		)
 
 	# Parse repository URL
-	parsed = parse_repo_url(payload.repo_url.strip())
+	parsed = parse_repo_url(payload.repo_url)
 	if not parsed:
 		raise HTTPException(status_code=400, detail="Invalid GitHub repository URL")
 	original_owner, repo = parsed
 	repo_full_name = f"{original_owner}/{repo}"
 
 	# Normalize org
-	normalized_org = payload.org.strip() if payload.org and payload.org.strip() else None
-
-	# Check if repository exists in database
-	exists = await repository_exists(repo_full_name, normalized_org)
-	if not exists:
-		raise HTTPException(
-			status_code=404,
-			detail=f"Repository {repo_full_name} (org={normalized_org}) not found in database. Please fork it first.",
-		)
+	normalized_org = normalize_org(payload.org)
 
-	# Get fork information from cache
+	# Get fork information from cache; a missing entry means the repository was never forked
 	fork_info = await get_cached_response(repo_full_name, normalized_org)
 	if not fork_info:
 		raise HTTPException(
 			status_code=404,
-			detail=f"Fork information for {repo_full_name} (org={normalized_org}) not found in cache.",
+			detail=f"Repository {repo_full_name} (org={normalized_org}) not found in database. Please fork it first.",
 		)
 
 	# Extract fork owner and repo name from fork response
@@ -893,29 +893,21 @@ async def update_workflow(payload: UpdateWorkflowRequest):
 	)
 
 	# Parse repository URL
-	parsed = parse_repo_url(payload.repo_url.strip())
+	parsed = parse_repo_url(payload.repo_url)
 	if not parsed:
 		raise HTTPException(status_code=400, detail="Invalid GitHub repository URL")
 	original_owner, repo = parsed
 	repo_full_name = f"{original_owner}/{repo}"
 
 	# Normalize org
-	normalized_org = payload.org.strip() if payload.org and payload.org.strip() else None
+	normalized_org = normalize_org(payload.org)
 
-	# Check if repository exists in database
-	exists = await repository_exists(repo_full_name, normalized_org)
-	if not exists:
-		raise HTTPException(
-			status_code=404,
-			detail=f"Repository {repo_full_name} (org={normalized_org}) not found in database. Please fork it first.",
-		)
-
-	# Get fork information from cache
+	# Get fork information from cache; a missing entry means the repository was never forked
 	fork_info = await get_cached_response(repo_full_name, normalized_org)
 	if not fork_info:
 		raise HTTPException(
 			status_code=404,
-			detail=f"Fork information for {repo_full_name} (org={normalized_org}) not found in cache.",
+			detail=f"Repository {repo_full_name} (org={normalized_org}) not found in database. Please fork it first.",
 		)
 
 	# Extract fork owner and repo name from fork response
@@ -1025,24 +1017,19 @@ async def sync_fork(payload: SyncForkRequest):
 	logger.info("POST /repos/sync-upstream received: repo_url=%s, org=%s, branch=%s", payload.repo_url, payload.org, payload.branch)
 
 	# Parse repository URL
-	parsed = parse_repo_url(payload.repo_url.strip())
+	parsed = parse_repo_url(payload.repo_url)
 	if not parsed:
 		raise HTTPException(status_code=400, detail="Invalid GitHub repository URL")
 	original_owner, repo = parsed
 	repo_full_name = f"{original_owner}/{repo}"
 
 	# Normalize org
-	normalized_org = payload.org.strip() if payload.org and payload.org.strip() else None
-
-	# Check repository exists in local cache
-	exists = await repository_exists(repo_full_name, normalized_org)
-	if not exists:
-		raise HTTPException(status_code=404, detail=f"Repository {repo_full_name} (org={normalized_org}) not found in database. Please fork it first.")
+	normalized_org = normalize_org(payload.org)
 
-	# Get fork info from cache
+	# Get fork info from local cache; a missing entry means the repository was never forked
 	fork_info = await get_cached_response(repo_full_name, normalized_org)
 	if not fork_info:
-		raise HTTPException(status_code=404, detail=f"Fork information for {repo_full_name} (org={normalized_org}) not found in cache.")
+		raise HTTPException(status_code=404, detail=f"Repository {repo_full_name} (org={normalized_org}) not found in database. Please fork it first.")
 
 	fork_owner = fork_info.get("owner", {}).get("login")
 	if not fork_owner:
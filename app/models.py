@@ -1,24 +1,22 @@
-from datetime import datetime
-from typing import Optional
-
-from sqlalchemy import Column, DateTime, Integer, String, Text, UniqueConstraint
-from sqlalchemy.orm import declarative_base
-
-Base = declarative_base()
-
-
-class RepositoryCache(Base):
-	__tablename__ = "repository_cache"
-	__table_args__ = (UniqueConstraint("repo_full_name", "org", name="uq_repository_org"),)
-
-	id = Column(Integer, primary_key=True, autoincrement=True)
-	repo_full_name = Column(String(512), nullable=False)
-	org = Column(String(255), nullable=True)
-	response_json = Column(Text, nullable=False)
-	created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-	updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-
-	def __repr__(self) -> str:  # pragma: no cover - helpful for debugging
-		return f"<RepositoryCache repo_full_name={self.repo_full_name!r} org={self.org!r}>"
-
-
+# Schema of the repository fork cache, applied at startup by app.database.init_db.
+# Column types match the tables SQLAlchemy created in earlier versions, so existing databases keep working.
+REPOSITORY_CACHE_SCHEMA = (
+	"""
+	CREATE TABLE IF NOT EXISTS repository_cache (
+		id INTEGER NOT NULL,
+		repo_full_name VARCHAR(512) NOT NULL,
+		org VARCHAR(255),
+		response_json BLOB NOT NULL,
+		created_at DATETIME NOT NULL,
+		updated_at DATETIME NOT NULL,
+		PRIMARY KEY (id)
+	)
+	""",
+	# The old UNIQUE (repo_full_name, org) constraint let concurrent no-org forks insert duplicate rows;
+	# keep only the newest row per key so the unique index can be created on such databases.
+	"DELETE FROM repository_cache WHERE id NOT IN ("
+	"SELECT max(id) FROM repository_cache GROUP BY repo_full_name, ifnull(org, ''))",
+	# SQLite treats NULLs as distinct in a UNIQUE index; indexing ifnull(org, '') keeps "no org" unique as well
+	# and gives the upsert's ON CONFLICT clause a target. Cache lookups use the same expression.
+	"CREATE UNIQUE INDEX IF NOT EXISTS ux_repo_org ON repository_cache (repo_full_name, ifnull(org, ''))",
+)